@@ -5,7 +5,16 @@ from . import server
 
 def main():
     """Main entry point for the package."""
-    asyncio.run(server.main())
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is not available on Windows, the default event loop is used there
+        loop_factory = None
+    else:
+        loop_factory = uvloop.new_event_loop
+    # asyncio.Runner takes a loop factory on 3.11, unlike asyncio.run, and leaves the global policy alone
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(server.main())
 
 
 # Optionally expose other important items at package level
@@ -1,12 +1,85 @@
+import asyncio
+import hashlib
+import importlib.util
+import json
 import time
+import urllib.request
 from logging import Logger
-from typing import Dict, Any, List
-from urllib.parse import quote_plus
+from typing import Dict, Any, List, Tuple, Callable, Awaitable
 
 import httpx
 import jwt
+import orjson
+
+# HTTP/2 needs the h2 package from httpx[http2], fall back to HTTP/1.1 keep-alive without it
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+# Seconds for which cached lookups are served before hitting the API again
+SUPPORTED_TAGS_TTL = 600
+PROTOCOL_PUBLISHERS_TTL = 60
+SEARCH_RESULTS_TTL = 30
+CACHE_MAX_ENTRIES = 256
+
+# Auth requests answered with one of these status codes are retried with exponential backoff
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+AUTH_MAX_ATTEMPTS = 3
+AUTH_RETRY_BASE_DELAY = 0.2
+AUTH_RETRY_MAX_DELAY = 10.0
+
+# Endpoints under <host>/eka-mcp/ called by the client, resolved to full URLs once per client
+API_ENDPOINTS = (
+    "linking/v1/snomed",
+    "protocols/v1/search",
+    "protocols/v1/publishers/tag",
+    "medications/v1/search",
+    "pharmacology/v1/search?query=",
+)
+
+# Sent with every JSON request body, which is encoded with orjson rather than by httpx
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Credentials are renewed this many seconds before the token actually expires
+TOKEN_EXPIRY_MARGIN = 120
+
+# One connection pool per API host, shared by every EkaCareClient in the process
+_shared_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _get_client(eka_api_host: str) -> httpx.AsyncClient:
+    """Return the process-wide HTTP client for eka_api_host, creating it on first use."""
+    client = _shared_clients.get(eka_api_host)
+    if client is None:
+        limits = httpx.Limits(
+            max_connections=32,
+            max_keepalive_connections=32,
+            keepalive_expiry=75.0
+        )
+        if urllib.request.getproxies():
+            # httpx ignores HTTP(S)_PROXY and NO_PROXY when given a transport, so proxied
+            # deployments keep the default transports and go without connect retries
+            client = httpx.AsyncClient(
+                base_url=f"{eka_api_host}/eka-mcp/",
+                timeout=30.0,
+                limits=limits,
+                http2=HTTP2_ENABLED
+            )
+        else:
+            client = httpx.AsyncClient(
+                base_url=f"{eka_api_host}/eka-mcp/",
+                timeout=30.0,
+                transport=httpx.AsyncHTTPTransport(retries=2, limits=limits, http2=HTTP2_ENABLED)
+            )
+        _shared_clients[eka_api_host] = client
+    return client
+
+
+async def close_shared_clients():
+    """Close every shared HTTP client and its connection pool, on application shutdown."""
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    for client in clients:
+        await client.aclose()
 
-import json
 
 class RefreshTokenError(Exception):
     pass
@@ -15,6 +88,9 @@ class CreateTokenError(Exception):
     pass
 
 class EkaCareClient:
+    # Number of clients constructed in this process; there should only ever be one
+    _instances = 0
+
     def __init__(
             self,
             eka_api_host: str,
@@ -23,7 +99,8 @@ class EkaCareClient:
             logger: Logger
     ):
         """
-        Initialize the EkaAssist client with connection pooling.
+        Initialize the EkaAssist client on the connection pool shared for eka_api_host.
+        Authentication happens lazily on the first request, or eagerly via `authenticate`.
 
         Args:
             eka_api_host: Base URL for the API
@@ -33,37 +110,90 @@ class EkaCareClient:
         """
 
         self.logger = logger
-        self.client = httpx.Client(
-            timeout=30.0,
-            limits=httpx.Limits(
-                max_connections=10,
-                max_keepalive_connections=5
-            ),
-            http2=False
-        )
+        EkaCareClient._instances += 1
+        if EkaCareClient._instances > 1:
+            self.logger.warning(
+                "EkaCareClient constructed %d times in this process, "
+                "share a single instance to reuse its credentials and caches",
+                EkaCareClient._instances
+            )
+
+        self.client = _get_client(eka_api_host)
+        self._methods = {"get": self.client.get, "post": self.client.post}
+        self._urls = {endpoint: self.client.base_url.join(endpoint) for endpoint in API_ENDPOINTS}
 
         self.api_url = eka_api_host
+        self._headers = {}
+        self._body_headers = dict(JSON_HEADERS)
         self.client_id = client_id
         self.client_secret = client_secret
-        self.auth_creds = self._get_auth_creds()
+        self.auth_creds = {}
+        # time.monotonic() deadline after which the token must be renewed
+        self._token_refresh_at = 0.0
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
 
-    def close(self):
-        """Close the HTTP client and its connection pool when done"""
-        self.client.close()
+    async def close(self):
+        """
+        Release this client when done. The shared connection pool stays open for
+        other clients until `close_shared_clients` is called on shutdown.
+        """
+        self._cache.clear()
 
-    def __enter__(self):
-        """Support for context manager usage with 'with' statement"""
+    async def __aenter__(self):
+        """Support for context manager usage with 'async with' statement"""
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Ensure connection pool is closed when exiting context"""
-        self.close()
-
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Release the client when exiting context"""
+        await self.close()
 
-    def _get_auth_creds(self):
+    async def warmup(self):
+        """
+        Prime the supported tags cache, and with it a pooled connection, before the first tool call.
+        Failures are only logged since the tags are fetched again on demand.
+        """
+        try:
+            await self.get_supported_tags()
+        except Exception as e:
+            self.logger.warning("Warmup request failed: %s", e)
+
+    async def authenticate(self):
+        """Fetch authentication credentials up front instead of on the first tool call."""
+        await self._coalesced("auth", self._renew_auth_creds)
+
+    async def _renew_auth_creds(self):
+        had_creds = bool(self.auth_creds)
+        if "refresh_token" in self.auth_creds:
+            try:
+                # Rotating with the refresh token costs one round trip instead of a full login
+                auth_creds = self._with_jwt_payload(await self._get_refresh_token(self.auth_creds))
+            except RefreshTokenError:
+                self.logger.warning("Token refresh failed, logging in again")
+                auth_creds = await self._get_auth_creds()
+        else:
+            auth_creds = await self._get_auth_creds()
+        self._set_auth_creds(auth_creds)
+        if had_creds:
+            # Responses cached under the previous credentials are dropped with them
+            self._cache.clear()
+
+    def _set_auth_creds(self, auth_creds):
+        """Store new credentials and the Authorization headers reused by every request."""
+        self.auth_creds = auth_creds
+        exp_at = int(auth_creds.get("jwt-payload", {}).get("exp", 0))
+        self._token_refresh_at = time.monotonic() + max(0, exp_at - int(time.time()) - TOKEN_EXPIRY_MARGIN)
+        if "access_token" in auth_creds:
+            authorization = "Bearer " + auth_creds["access_token"]
+            self._headers["Authorization"] = authorization
+            self._body_headers["Authorization"] = authorization
+
+    async def _get_auth_creds(self):
         """
         Obtain authentication credentials by first retrieving a client token
-        and then exchanging it for a refresh token.
+        and then exchanging it for a refresh token. The exchange is skipped when the
+        login response is already a complete credential set whose token is not about
+        to expire, saving one round trip.
 
         Returns:
             dict: A dictionary containing the final authentication credentials,
@@ -73,15 +203,54 @@ class EkaCareClient:
         if not self.client_id or not self.client_secret:
             return {}
 
-        auth_creds = self._get_client_token()
-        auth_creds = self._get_refresh_token(auth_creds)
-        token = auth_creds["access_token"]
-        jwt_payload = jwt.decode(token, options={"verify_signature": False})
-        auth_creds["jwt-payload"] = jwt_payload
+        auth_creds = await self._get_client_token()
+        if not self._is_complete_login(auth_creds):
+            auth_creds = await self._get_refresh_token(auth_creds)
+        return self._with_jwt_payload(auth_creds)
+
+    @staticmethod
+    def _is_complete_login(auth_creds) -> bool:
+        if "access_token" not in auth_creds or "refresh_token" not in auth_creds:
+            return False
+        if "expires_in" in auth_creds:
+            return True
+        try:
+            jwt_payload = jwt.decode(auth_creds["access_token"], options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return False
+        return int(jwt_payload.get("exp", 0)) - time.time() > TOKEN_EXPIRY_MARGIN
+
+    @staticmethod
+    def _with_jwt_payload(auth_creds):
+        auth_creds["jwt-payload"] = jwt.decode(auth_creds["access_token"], options={"verify_signature": False})
         return auth_creds
 
 
-    def _get_refresh_token(self, auth_creds):
+    async def _post_auth(self, url: str, data: Dict[str, Any]):
+        """
+        POST to an auth endpoint, retrying rate-limited and 5xx responses with
+        exponential backoff (or the server's Retry-After) before giving up.
+
+        Raises:
+            httpx.HTTPStatusError: If the final attempt still fails
+        """
+        body = orjson.dumps(data)
+        for attempt in range(AUTH_MAX_ATTEMPTS):
+            resp = await self.client.post(url, content=body, headers=JSON_HEADERS)
+            if resp.status_code not in RETRYABLE_STATUS_CODES or attempt == AUTH_MAX_ATTEMPTS - 1:
+                resp.raise_for_status()
+                return orjson.loads(resp.content)
+
+            delay = AUTH_RETRY_BASE_DELAY * 2 ** attempt
+            retry_after = resp.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(float(retry_after), AUTH_RETRY_MAX_DELAY)
+            self.logger.warning(
+                "Auth request to %s returned %s, retrying in %.1fs", url, resp.status_code, delay
+            )
+            await asyncio.sleep(delay)
+
+    async def _get_refresh_token(self, auth_creds):
         """
         Refresh the authentication token using the provided credentials.
 
@@ -89,7 +258,8 @@ class EkaCareClient:
             auth_creds: Dictionary containing access_token and refresh_token
 
         Returns:
-            Dictionary containing refreshed authentication credentials with expiration time
+            Dictionary containing refreshed authentication credentials with expiration time.
+            The previous refresh_token is kept when the response does not rotate it.
 
         Raises:
             RefreshTokenError: If the refresh token request fails
@@ -101,18 +271,18 @@ class EkaCareClient:
         }
 
         try:
-            resp = self.client.post(url, json=data)
-            resp.raise_for_status()
-            return resp.json()
+            refreshed = await self._post_auth(url, data)
+            refreshed.setdefault("refresh_token", auth_creds["refresh_token"])
+            return refreshed
         except httpx.HTTPStatusError as e:
-            self.logger.error(f"Token refresh failed: {e}")
+            self.logger.error("Token refresh failed: %s", e)
             raise RefreshTokenError(f"Failed to refresh token: {str(e)}") from e
         except Exception as e:
-            self.logger.error(f"Unexpected error during token refresh: {e}")
+            self.logger.error("Unexpected error during token refresh: %s", e)
             raise RefreshTokenError(f"Unexpected error: {str(e)}") from e
 
 
-    def _get_client_token(self):
+    async def _get_client_token(self):
         """
         Authenticate with the Eka API using client credentials and obtain a valid token.
 
@@ -129,30 +299,72 @@ class EkaCareClient:
         }
 
         try:
-            resp = self.client.post(url, json=data)
-            resp.raise_for_status()
-            return resp.json()
+            return await self._post_auth(url, data)
         except httpx.HTTPStatusError as e:
-            self.logger.error(f"Client token creation failed: {e}")
+            self.logger.error("Client token creation failed: %s", e)
             raise CreateTokenError(f"Failed to create token: {str(e)}")
         except Exception as e:
-            self.logger.error(f"Unexpected error during token creation: {e}")
+            self.logger.error("Unexpected error during token creation: %s", e)
             raise CreateTokenError(f"Unexpected error: {str(e)}")
 
 
-    def _validate_and_gen_token(self):
+    def _is_token_expired(self):
+        return time.monotonic() >= self._token_refresh_at
+
+    async def _validate_and_gen_token(self):
         """
         Validate the current authentication token.
-        Updates self.auth_creds with new credentials if the current token is expired.
+        Updates self.auth_creds with new credentials if the current token is expired or missing.
+        Concurrent callers share a single in-flight refresh, including its failure,
+        instead of each fetching new credentials.
         """
 
-        current_time = int(time.time())
-        exp_at = self.auth_creds["jwt-payload"].get("exp", 0)
-        if current_time >= exp_at - 120:
-            self.auth_creds = self._get_auth_creds()
+        if self._is_token_expired():
+            await self._coalesced("auth", self._renew_auth_creds)
 
         return self.auth_creds['access_token']
 
+    async def _cached(self, key: str, ttl: float, fn: Callable[[], Awaitable[Any]]):
+        """
+        Return the cached value for key while it is younger than ttl seconds,
+        otherwise await fn() and cache its result. None results are not cached.
+        Concurrent misses for the same key share a single call to fn.
+        """
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        return await self._coalesced(key, lambda: self._fetch_into_cache(key, fn))
+
+    async def _fetch_into_cache(self, key: str, fn: Callable[[], Awaitable[Any]]):
+        now = time.monotonic()
+        value = await fn()
+        if value is not None:
+            self._cache.pop(key, None)
+            self._cache[key] = (now, value)
+            if len(self._cache) > CACHE_MAX_ENTRIES:
+                # Entries are kept in insertion order, so the first one is the oldest
+                del self._cache[next(iter(self._cache))]
+        return value
+
+    @staticmethod
+    def _request_key(endpoint: str, arguments: Dict[str, Any]) -> str:
+        """Build a compact cache key from an endpoint and its canonically encoded arguments."""
+        body = orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS)
+        return f"{endpoint}:{hashlib.blake2b(body, digest_size=16).hexdigest()}"
+
+    async def _coalesced(self, key: str, fn: Callable[[], Awaitable[Any]]):
+        """
+        Share a single in-flight request between concurrent callers asking for the same key,
+        so N identical tool calls issued in parallel cost one round trip.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
     @staticmethod
     def _extract_key_value(key, **kwargs):
         key_value = ""
@@ -166,13 +378,13 @@ class EkaCareClient:
 
         return key_value
 
-    def _make_request(self, method: str, endpoint: str, **kwargs):
+    async def _make_request(self, method: str, endpoint: str, **kwargs):
         """
         Helper method to make HTTP requests and handle errors consistently.
 
         Args:
-            method: HTTP method (get, post, etc.)
-            endpoint: API endpoint to call
+            method: HTTP method, "get" or "post" in any case
+            endpoint: API endpoint to call, one of API_ENDPOINTS
             **kwargs: Additional arguments to pass to the request
 
         Returns:
@@ -182,86 +394,106 @@ class EkaCareClient:
             httpx.HTTPStatusError: If the request fails
         """
 
-        headers = {"Content-Type": "application/json"}
+        send = self._methods.get(method.lower())
+        if send is None:
+            raise ValueError(f"Unsupported HTTP method: {method}")
 
         auth_token_passed = self._extract_key_value("auth", **kwargs)
         jwt_payload = self._extract_key_value("jwt-payload", **kwargs)
 
-        if jwt_payload:
-            headers['jwt-payload'] = jwt_payload
-        elif auth_token_passed:
-            headers["Authorization"] = f"Bearer {auth_token_passed}"
+        # Only requests that carry a body need a Content-Type header
+        has_body = "json" in kwargs
+        if jwt_payload or auth_token_passed:
+            if jwt_payload:
+                headers = {"jwt-payload": jwt_payload}
+            else:
+                headers = {"Authorization": f"Bearer {auth_token_passed}"}
+            if has_body:
+                headers.update(JSON_HEADERS)
         else:
-            self._validate_and_gen_token()
-            headers["Authorization"] = f"Bearer {self.auth_creds['access_token']}"
+            await self._validate_and_gen_token()
+            headers = self._body_headers if has_body else self._headers
 
-        url = f"{self.api_url}/eka-mcp/{endpoint}"
+        url = self._urls[endpoint]
+        if has_body:
+            kwargs["content"] = orjson.dumps(kwargs.pop("json"))
         try:
-            if method.lower() == "get":
-                response = self.client.get(url, headers=headers, **kwargs)
-            elif method.lower() == "post":
-                response = self.client.post(url, headers=headers, **kwargs)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-
+            response = await send(url, headers=headers, **kwargs)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except httpx.HTTPStatusError as e:
-            self.logger.error(f"API request failed: {e}")
+            self.logger.error("API request failed: %s", e)
+            if e.response.status_code == 401 and not (jwt_payload or auth_token_passed):
+                # The token was rejected before its deadline, renew it on the next request
+                self._token_refresh_at = 0.0
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error during API request: {e}")
+            self.logger.error("Unexpected error during API request: %s", e)
             raise
 
     # Snomed Linker
-    def get_snomed_linker(self, arguments: List[str]) -> List[Dict[str, Any]]:
+    async def get_snomed_linker(self, arguments: List[str]) -> List[Dict[str, Any]]:
         """Gets a list of all diseases matching with given name from the API."""
         query_list = arguments.get("query", [])
 
-        payload = json.dumps(query_list)
-        encoded = quote_plus(payload)
-
-        endpoint = f"linking/v1/snomed?text_to_link={encoded}"
-        return self._make_request("get", endpoint)
+        # The stdlib encoding (", " separators, \uXXXX escapes) is what the API has always received
+        params = {"text_to_link": json.dumps(query_list)}
+        return await self._cached(
+            self._request_key("linking/v1/snomed", arguments),
+            SEARCH_RESULTS_TTL,
+            lambda: self._make_request("get", "linking/v1/snomed", params=params)
+        )
             
     #  Protocol endpoints
-    def get_protocols(self, arguments: Dict[str, Any]):
+    async def get_protocols(self, arguments: Dict[str, Any]):
         """Get a list of protocols from the API."""
-        return self._make_request("post", "protocols/v1/search", json=arguments)
+        return await self._cached(
+            self._request_key("protocols/v1/search", arguments),
+            SEARCH_RESULTS_TTL,
+            lambda: self._make_request("post", "protocols/v1/search", json=arguments)
+        )
 
-    def get_protocol_publisher(self, arguments: Dict[str, Any]):
+    async def get_protocol_publisher(self, arguments: Dict[str, Any]):
         """Get the list of all publishers for given conditions/tag."""
-        return self._make_request("get", "protocols/v1/publishers/tag", params=arguments)
+        return await self._cached(
+            self._request_key("protocols/v1/publishers/tag", arguments),
+            PROTOCOL_PUBLISHERS_TTL,
+            lambda: self._make_request("get", "protocols/v1/publishers/tag", params=arguments)
+        )
 
     # Medication endpoints
-    def get_suggested_drugs(self, arguments: Dict[str, Any]):
+    async def get_suggested_drugs(self, arguments: Dict[str, Any]):
         """Gets a list of all drugs matching with given name from the API."""
-        return self._make_request("get", "medications/v1/search", params=arguments)
+        return await self._cached(
+            self._request_key("medications/v1/search", arguments),
+            SEARCH_RESULTS_TTL,
+            lambda: self._make_request("get", "medications/v1/search", params=arguments)
+        )
 
     # Pharmacology Search
-    def get_pharmacology_search(self, arguments: Dict[str, Any]):
+    async def get_pharmacology_search(self, arguments: Dict[str, Any]):
         """Gets Pharmacology Search with given name from the API."""
-        return self._make_request("get", "pharmacology/v1/search?query=", params=arguments)
+        return await self._cached(
+            self._request_key("pharmacology/v1/search", arguments),
+            SEARCH_RESULTS_TTL,
+            lambda: self._make_request("get", "pharmacology/v1/search?query=", params=arguments)
+        )
 
-    def get_supported_tags(self):
+    async def get_supported_tags(self):
         """
         Gets a list of supported tags/condition names in lowercase.
+        The tags are cached for SUPPORTED_TAGS_TTL seconds and shared between callers,
+        so they are returned as an immutable tuple.
 
         Returns:
-            List of tags/condition names as strings
+            Tuple of tags/condition names as strings
         """
-
-        tags = {}
-        resp = self.client.get("https://lucid.eka.care/protocols/tags/data.json")
-        if resp.status_code == 200:
-            tags = resp.json()
-
-        supported_tags = []
-        for tag in tags:
-            # Fixed the method call order: strip() then lower()
-            text = tag.get("text", "")
-            if not text:
-                continue
-            supported_tags.append(text)
-
-        return supported_tags
+        supported_tags = await self._cached("supported_tags", SUPPORTED_TAGS_TTL, self._fetch_supported_tags)
+        return supported_tags or ()
+
+    async def _fetch_supported_tags(self):
+        resp = await self.client.get("https://lucid.eka.care/protocols/tags/data.json")
+        if resp.status_code != 200:
+            return None
+        tags = orjson.loads(resp.content)
+        return tuple(text for tag in tags if (text := tag.get("text")))
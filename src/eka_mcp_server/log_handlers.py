@@ -0,0 +1,147 @@
+import logging
+import os
+import re
+import threading
+import time
+from logging.handlers import MemoryHandler, RotatingFileHandler
+from typing import List
+
+
+# The log file is written through an unbuffered append-only descriptor, so each write is one syscall
+_OPEN_FLAGS = (
+    os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+)
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that can write a batch of records with a single write call.
+    Records are encoded to UTF-8 once and appended to the raw file descriptor,
+    bypassing the text layer and its user space buffer.
+    On rollover the full file is renamed once to <name>.<time in ns> and logging resumes
+    in a fresh file, while backups beyond backupCount are deleted on a worker thread.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._size = 0
+        super().__init__(*args, **kwargs)
+        self._janitor: threading.Thread | None = None
+        self._last_backup_ns = 0
+        self._backup_pattern = re.compile(re.escape(os.path.basename(self.baseFilename)) + r"\.(\d+)$")
+
+    def _open(self):
+        fd = os.open(self.baseFilename, _OPEN_FLAGS, 0o644)
+        self._size = os.fstat(fd).st_size
+        return open(fd, "ab", buffering=0)
+
+    def doRollover(self) -> None:
+        # Old backups are deleted one rollover at a time
+        self._wait_for_janitor()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if self.backupCount > 0 and os.path.exists(self.baseFilename):
+            # Timestamped names make rotation a single rename, however many backups are kept
+            self._last_backup_ns = max(time.time_ns(), self._last_backup_ns + 1)
+            os.replace(self.baseFilename, f"{self.baseFilename}.{self._last_backup_ns}")
+            self._janitor = threading.Thread(target=self._remove_old_backups, daemon=True)
+            self._janitor.start()
+        if not self.delay:
+            self.stream = self._open()
+
+    def _remove_old_backups(self) -> None:
+        directory = os.path.dirname(self.baseFilename)
+        backups = sorted(
+            (int(match.group(1)), name)
+            for name in os.listdir(directory)
+            if (match := self._backup_pattern.match(name))
+        )
+        for _, name in backups[:-self.backupCount]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    def _wait_for_janitor(self) -> None:
+        if self._janitor is not None:
+            self._janitor.join()
+            self._janitor = None
+
+    def close(self) -> None:
+        self._wait_for_janitor()
+        super().close()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._write_records([record])
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        with self.lock:
+            self._write_records([record for record in records if self.filter(record)])
+
+    def _write_records(self, records: List[logging.LogRecord]) -> None:
+        pending = []
+        for record in records:
+            try:
+                data = (self.format(record) + self.terminator).encode("utf-8")
+                # Opening reads the current file size, so it must happen before this record is counted
+                self._ensure_open()
+                if self._size and 0 < self.maxBytes <= self._size + len(data):
+                    self._append(pending)
+                    pending = []
+                    self.doRollover()
+                    self._ensure_open()
+            except Exception:
+                self.handleError(record)
+                continue
+            pending.append(data)
+            self._size += len(data)
+        try:
+            self._append(pending)
+        except Exception:
+            self.handleError(records[-1])
+
+    def _ensure_open(self) -> None:
+        if self.stream is None:
+            self.stream = self._open()
+
+    def _append(self, chunks: List[bytes]) -> None:
+        data = memoryview(b"".join(chunks))
+        # Raw writes may be partial
+        while data:
+            data = data[self.stream.write(data):]
+
+
+class TimedMemoryHandler(MemoryHandler):
+    """
+    MemoryHandler that writes buffered records to its target in batches: when the
+    buffer is full, when a record at flushLevel or above arrives, or at the latest
+    flush_interval seconds after the first record was buffered.
+    Targets with a handle_batch method receive the whole batch in one call.
+    """
+
+    def __init__(self, capacity: int, target: logging.Handler, flush_interval: float = 1.0,
+                 flushLevel: int = logging.ERROR):
+        super().__init__(capacity, flushLevel=flushLevel, target=target, flushOnClose=True)
+        self.flush_interval = flush_interval
+        self._timer: threading.Timer | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        # The handler lock is held by handle(), so the timer is armed at most once per batch
+        if self.buffer and self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            handle_batch = getattr(self.target, "handle_batch", None)
+            if handle_batch is None:
+                super().flush()
+            elif self.buffer:
+                handle_batch(self.buffer)
+                self.buffer.clear()
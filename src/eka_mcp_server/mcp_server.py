@@ -1,7 +1,8 @@
-import json
+import asyncio
 from logging import Logger
 
 import mcp.types as types
+import orjson
 from mcp.server import Server
 from typing import List
 
@@ -22,44 +23,56 @@ from .models import (
 )
 from .utils import download_image
 
+# Tool input schemas are static, so they are generated once instead of on every list_tools call
+_DRUG_SEARCH_SCHEMA = IndianBrandedDrugSearch.model_json_schema(mode="serialization")
+_PROTOCOL_SEARCH_SCHEMA = QueryProtocols.model_json_schema(mode="serialization")
+_PROTOCOL_PUBLISHERS_SCHEMA = ProtocolPublisher.model_json_schema(mode="serialization")
+_PHARMACOLOGY_SEARCH_SCHEMA = PharmacologySearch.model_json_schema(mode="serialization")
+
 
 def initialize_mcp_server(client: EkaCareClient, logger: Logger):
     # Store notes as a simple key-value dict to demonstrate state management
     server = Server("eka-mcp-server")
+    # Last tool list built, keyed by the tags it was built from
+    listed_tools: tuple[tuple[str, ...], list[types.Tool]] | None = None
 
     @server.list_tools()
     async def handle_list_tools() -> list[types.Tool]:
         """
         List available tools.
         Each tool specifies its arguments using JSON Schema validation.
+        The list is rebuilt only when the supported tags change.
         """
+        nonlocal listed_tools
         logger.info("Listing tools now")
-        tags = client.get_supported_tags()
+        tags = await client.get_supported_tags()
+        if listed_tools is None or listed_tools[0] != tags:
+            listed_tools = (tags, _build_tools(tags))
+        return listed_tools[1]
 
+    def _build_tools(tags: tuple[str, ...]) -> list[types.Tool]:
         return [
             types.Tool(
                 name="indian_branded_drug_search",
                 description=INDIAN_BRANDED_DRUG_SEARCH,
-                inputSchema=IndianBrandedDrugSearch.model_json_schema(
-                    mode="serialization"
-                ),
+                inputSchema=_DRUG_SEARCH_SCHEMA,
             ),
             types.Tool(
                 name="indian_treatment_protocol_search",
                 description=INDIAN_TREATMENT_PROTOCOL_SEARCH.format(
                     tags=", ".join(tags)
                 ),
-                inputSchema=QueryProtocols.model_json_schema(mode="serialization"),
+                inputSchema=_PROTOCOL_SEARCH_SCHEMA,
             ),
             types.Tool(
                 name="protocol_publishers",
                 description=PROTOCOL_PUBLISHERS_DESC.format(", ".join(tags)),
-                inputSchema=ProtocolPublisher.model_json_schema(mode="serialization"),
+                inputSchema=_PROTOCOL_PUBLISHERS_SCHEMA,
             ),
             types.Tool(
                 name="indian_pharmacology_details",
                 description=PHARMACOLOGY_SEARCH_DESC.format(", ".join(tags)),
-                inputSchema=PharmacologySearch.model_json_schema(mode="serialization"),
+                inputSchema=_PHARMACOLOGY_SEARCH_SCHEMA,
             ),
         ]
 
@@ -74,60 +87,64 @@ def initialize_mcp_server(client: EkaCareClient, logger: Logger):
         if not arguments:
             raise ValueError("Missing arguments")
 
-        # Map tool names to handler functions for cleaner dispatching
-        tool_handlers = {
-            "indian_branded_drug_search": _handle_indian_branded_drug_search,
-            "indian_treatment_protocol_search": _handle_indian_treatment_protocol_search,
-            "protocol_publishers": _handle_protocol_publishers,
-            "snomed_linker": _handle_snomed_linker,
-            "indian_pharmacology_details": _handle_pharmacology_search,
-        }
-
-        if name not in tool_handlers:
+        handler = tool_handlers.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
 
-        return await tool_handlers[name](arguments)
+        return await handler(arguments)
 
     # Helper functions for tool handlers
     async def _handle_indian_branded_drug_search(arguments):
-        drugs = client.get_suggested_drugs(arguments)
-        return [types.TextContent(type="text", text=json.dumps(drugs))]
+        drugs = await client.get_suggested_drugs(arguments)
+        return [types.TextContent(type="text", text=orjson.dumps(drugs).decode())]
 
     async def _handle_indian_treatment_protocol_search(arguments):
-        protocols = client.get_protocols(arguments)
+        protocols = await client.get_protocols(arguments)
+        images = await asyncio.gather(
+            *(download_image(protocol.get("url")) for protocol in protocols),
+            return_exceptions=True,
+        )
         output = []
-        for protocol in protocols:
+        for protocol, data in zip(protocols, images):
             url = protocol.get("url")
-            try:
-                data = download_image(url)
-                output.append(
-                    types.ImageContent(
-                        type="image",
-                        data=data,
-                        mimeType="image/jpeg",
-                        # TODO: this can be used by LLM to generate a better response
-                        url=url,
-                        publisher=protocol.get("author"),
-                        publication_year=protocol.get("publication_year"),
-                        source_url=protocol.get("source_url"),
-                    )
-                )
-            except Exception as err:
+            if isinstance(data, Exception):
                 logger.error(
-                    f"Failed to download protocol url: {protocol.get('url')}, with error: {err}"
+                    "Failed to download protocol url: %s, with error: %s", url, data
+                )
+                continue
+            output.append(
+                types.ImageContent(
+                    type="image",
+                    data=data,
+                    mimeType="image/jpeg",
+                    # TODO: this can be used by LLM to generate a better response
+                    url=url,
+                    publisher=protocol.get("author"),
+                    publication_year=protocol.get("publication_year"),
+                    source_url=protocol.get("source_url"),
                 )
+            )
         return output
 
     async def _handle_protocol_publishers(arguments):
-        publishers = client.get_protocol_publisher(arguments)
-        return [types.TextContent(type="text", text=json.dumps(publishers))]
+        publishers = await client.get_protocol_publisher(arguments)
+        return [types.TextContent(type="text", text=orjson.dumps(publishers).decode())]
 
     async def _handle_snomed_linker(arguments: List[str]):
-        response = client.get_snomed_linker(arguments)
-        return [types.TextContent(type="text", text=json.dumps(response))]
+        response = await client.get_snomed_linker(arguments)
+        return [types.TextContent(type="text", text=orjson.dumps(response).decode())]
 
     async def _handle_pharmacology_search(arguments):
-        response = client.get_pharmacology_search(arguments)
-        return [types.TextContent(type="text", text=json.dumps(response))]
+        response = await client.get_pharmacology_search(arguments)
+        return [types.TextContent(type="text", text=orjson.dumps(response).decode())]
+
+    # Map tool names to handler functions, built once instead of on every call
+    tool_handlers = {
+        "indian_branded_drug_search": _handle_indian_branded_drug_search,
+        "indian_treatment_protocol_search": _handle_indian_treatment_protocol_search,
+        "protocol_publishers": _handle_protocol_publishers,
+        "snomed_linker": _handle_snomed_linker,
+        "indian_pharmacology_details": _handle_pharmacology_search,
+    }
 
     return server
@@ -1,63 +1,139 @@
 import argparse
+import asyncio
 
 import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
 
-import mcp.server.stdio
-from eka_mcp_server.eka_client import EkaCareClient
-from mcp.server import NotificationOptions
-from mcp.server.models import InitializationOptions
 
-# from .eka_client import EkaCareClient
-from eka_mcp_server.mcp_server import initialize_mcp_server
+_PARSER = argparse.ArgumentParser(description='Eka MCP server. Documentation available at - https://github.com/eka-care/eka_mcp_server/blob/main/README.md')
+_PARSER.add_argument('--eka-api-host', required=True, help='EKA MCP API Host')
+_PARSER.add_argument('--client-id', required=False, help='EKA MCP API Client ID')
+_PARSER.add_argument('--client-secret', required=False, help='EKA MCP Client Secret')
+_PARSER.add_argument('--log-file', required=False, help='Also write logs to this file, rotated at 10 MB')
 
+# Size at which the log file is rotated, and how many rotated files are kept
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+# Records buffered before the log file is written, unless an error or a second passes first
+LOG_FILE_BUFFER_RECORDS = 512
+LOG_FILE_FLUSH_INTERVAL = 1.0
 
-async def main() -> None:
+
+def parse_arguments(argv=None) -> argparse.Namespace:
+    """Parse the server arguments with the parser built once at import."""
+    return _PARSER.parse_args(argv)
+
+
+def _configure_logging(log_file: str | None = None) -> QueueListener:
     """
-    Main entry point for the application.
+    Route all log records through a queue so that handler I/O, including writes to
+    and rotation of the optional log file, runs on the listener's background thread
+    instead of the event loop.
     """
+    # stdout carries the JSON-RPC frames of the stdio transport, logs must never reach it
+    stream_handler = logging.StreamHandler(sys.stderr)
+    # Epoch seconds instead of asctime avoid a strftime call per record
+    stream_handler.setFormatter(
+        logging.Formatter('%(created).3f %(levelname).1s %(name)s %(message)s', datefmt=None)
+    )
 
-    # Configure logging
+    handlers = [stream_handler]
+    if log_file:
+        from .log_handlers import BatchRotatingFileHandler, TimedMemoryHandler
+
+        file_handler = BatchRotatingFileHandler(
+            log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT
+        )
+        file_handler.setFormatter(stream_handler.formatter)
+        handlers.append(TimedMemoryHandler(
+            LOG_FILE_BUFFER_RECORDS, file_handler, flush_interval=LOG_FILE_FLUSH_INTERVAL
+        ))
+
+    # Records are created on the event loop, skip the caller lookup and the thread and
+    # process details that no handler formats
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
+    log_queue = queue.SimpleQueue()
+    # Records are fully formatted by the listener's handlers, the queue only carries the message.
+    # force replaces any handler installed before this point, which could be writing to stdout
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format='%(message)s',
         handlers=[
-            logging.StreamHandler()
-        ]
+            QueueHandler(log_queue)
+        ],
+        force=True
     )
 
-    logger = logging.getLogger("main")
-    logger.info("Starting Eka MCP server..")
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
 
-    logger.info("Validating server arguments..")
-    parser = argparse.ArgumentParser(description='Eka MCP server. Documentation available at - https://github.com/eka-care/eka_mcp_server/blob/main/README.md')
-    parser.add_argument('--eka-api-host', required=True, help='EKA MCP API Host')
-    parser.add_argument('--client-id', required=False, help='EKA MCP API Client ID')
-    parser.add_argument('--client-secret', required=False, help='EKA MCP Client Secret')
-
-    args = parser.parse_args()
-    # Initialize the EkaMCP client
-    eka_mcp = EkaCareClient(
-        eka_api_host=args.eka_api_host,
-        client_id=args.client_id,
-        client_secret=args.client_secret,
-        logger=logger
-    )
 
-    # Initialize and run the MCP server
-    server = initialize_mcp_server(eka_mcp, logger)
+async def main() -> None:
+    """
+    Main entry point for the application.
+    """
+
+    args = parse_arguments()
+
+    # Configure logging
+    log_listener = _configure_logging(args.log_file)
+    try:
+        await _run(args, logging.getLogger("main"))
+    finally:
+        log_listener.stop()
+        for handler in log_listener.handlers:
+            handler.flush()
+
 
-    # await handle_stdio(server, init_options)
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
+async def _run(args: argparse.Namespace, logger: logging.Logger) -> None:
+    """Build the Eka client from the server arguments and serve MCP over stdio."""
+    # The MCP SDK and the client stack take most of the start up time, they are only imported
+    # once the arguments are valid and logging is configured
+    from mcp.server import NotificationOptions
+    from mcp.server.models import InitializationOptions
+
+    from .eka_client import EkaCareClient, close_shared_clients
+    from .mcp_server import initialize_mcp_server
+    from .stdio import stdio_server
+    from .utils import close_image_client
+
+    logger.info("Starting Eka MCP server..")
+
+    try:
+        # Initialize the EkaMCP client, shared by every tool handler for the lifetime of the server
+        async with EkaCareClient(
+            eka_api_host=args.eka_api_host,
+            client_id=args.client_id,
+            client_secret=args.client_secret,
+            logger=logger
+        ) as eka_mcp:
+            # Authenticate and warm the connection pool concurrently, both finish before serving
+            # so the first tool call finds credentials, cached tags and open connections
+            await asyncio.gather(eka_mcp.warmup(), eka_mcp.authenticate())
+
+            # Initialize and run the MCP server
+            server = initialize_mcp_server(eka_mcp, logger)
+            # The handlers are registered once, so the advertised capabilities are computed once
+            init_options = InitializationOptions(
                 server_name="eka_mcp_server",
                 server_version="0.1.0",
                 capabilities=server.get_capabilities(
                     notification_options=NotificationOptions(),
                     experimental_capabilities={},
                 ),
-            ),
-        )
-    logger.info(f"Eka MCP Server started")
+            )
+
+            async with stdio_server() as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, init_options)
+    finally:
+        # Shared connection pools outlive individual clients, close them last
+        await close_image_client()
+        await close_shared_clients()
+    logger.info("Eka MCP Server started")
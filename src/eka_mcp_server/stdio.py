@@ -0,0 +1,162 @@
+"""
+Stdio transport for the MCP server. A drop-in replacement for
+mcp.server.stdio.stdio_server that talks to stdin and stdout through asyncio pipes
+instead of worker threads, and coalesces outgoing JSON-RPC frames so that
+responses completing together reach stdout in a single write.
+"""
+import asyncio
+import os
+import stat
+import sys
+from contextlib import asynccontextmanager
+
+import anyio
+import anyio.lowlevel
+import mcp.server.stdio
+import mcp.types as types
+import orjson
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.shared.message import SessionMessage
+
+# Frames waiting behind the first one are joined into the same write up to this many bytes
+MAX_WRITE_BATCH_BYTES = 64 * 1024
+# Bytes buffered from stdin before the pipe is paused, and the most taken per read
+STDIN_READ_LIMIT = 4 * 1024 * 1024
+STDIN_CHUNK_SIZE = 256 * 1024
+
+
+def _encode(session_message: SessionMessage) -> bytes:
+    """
+    Encode one newline-terminated frame. The session has already dumped results to
+    JSON-compatible values, and orjson serializes them several times faster than
+    pydantic on large payloads such as base64 images.
+    """
+    message = session_message.message
+    try:
+        return orjson.dumps(message.model_dump(by_alias=True, exclude_none=True), option=orjson.OPT_APPEND_NEWLINE)
+    except TypeError:
+        # Values orjson does not know, such as URLs, are left to pydantic
+        return types.JSONRPCMessage.__pydantic_serializer__.to_json(message, by_alias=True, exclude_none=True) + b"\n"
+
+
+def _is_pipe(fd: int) -> bool:
+    mode = os.fstat(fd).st_mode
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+
+async def _read_lines(stdin: asyncio.StreamReader):
+    """
+    Yield the non-empty newline-delimited frames read from stdin as bytes. Chunks are
+    split on raw bytes, and the pieces of a frame spanning several chunks are joined
+    once, so reading stays linear in the frame size and nothing is decoded twice.
+    """
+    pieces: list[bytes] = []
+    while chunk := await stdin.read(STDIN_CHUNK_SIZE):
+        *lines, rest = chunk.split(b"\n")
+        if lines and pieces:
+            pieces.append(lines[0])
+            lines[0] = b"".join(pieces)
+            pieces = []
+        for line in lines:
+            if line:
+                yield line
+        if rest:
+            pieces.append(rest)
+    if pieces:
+        yield b"".join(pieces)
+
+
+async def _connect_stdio() -> tuple[asyncio.StreamReader, asyncio.StreamWriter, asyncio.BaseTransport]:
+    """
+    Connect duplicates of the stdin and stdout descriptors to the running loop,
+    so closing the transports never closes the standard handles.
+    """
+    loop = asyncio.get_running_loop()
+    stdin = os.fdopen(os.dup(sys.stdin.fileno()), "rb", buffering=0)
+    stdout = os.fdopen(os.dup(sys.stdout.fileno()), "wb", buffering=0)
+    try:
+        reader = asyncio.StreamReader(limit=STDIN_READ_LIMIT)
+        read_transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stdin)
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, stdout)
+    except BaseException:
+        stdin.close()
+        stdout.close()
+        raise
+    return reader, asyncio.StreamWriter(transport, protocol, None, loop), read_transport
+
+
+@asynccontextmanager
+async def stdio_server(
+    stdin: asyncio.StreamReader | None = None,
+    stdout: asyncio.StreamWriter | None = None,
+):
+    """
+    Serve MCP over the process' stdin and stdout, or over the given streams.
+    Unless both standard handles are pipes or sockets, as when spawned by an MCP
+    client on POSIX, the upstream threaded transport is used instead.
+    """
+    owns_streams = stdin is None or stdout is None
+    if owns_streams:
+        try:
+            # Windows event loops cannot wrap the standard handles, and uvloop aborts on regular files
+            if sys.platform == "win32" or not (_is_pipe(sys.stdin.fileno()) and _is_pipe(sys.stdout.fileno())):
+                raise NotImplementedError("stdin and stdout are not pipes")
+            stdin, stdout, stdin_transport = await _connect_stdio()
+        except (OSError, ValueError, NotImplementedError):
+            async with mcp.server.stdio.stdio_server() as streams:
+                yield streams
+            return
+
+    read_stream: MemoryObjectReceiveStream[SessionMessage | Exception]
+    read_stream_writer: MemoryObjectSendStream[SessionMessage | Exception]
+
+    write_stream: MemoryObjectSendStream[SessionMessage]
+    write_stream_reader: MemoryObjectReceiveStream[SessionMessage]
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def stdin_reader():
+        try:
+            async with read_stream_writer:
+                async for line in _read_lines(stdin):
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(line)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+
+                    await read_stream_writer.send(SessionMessage(message))
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async def stdout_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    batch = [_encode(session_message)]
+                    size = len(batch[0])
+                    # Let responses finishing in the same loop iteration join this write
+                    await anyio.lowlevel.checkpoint()
+                    while size < MAX_WRITE_BATCH_BYTES:
+                        try:
+                            frame = _encode(write_stream_reader.receive_nowait())
+                        except (anyio.WouldBlock, anyio.EndOfStream):
+                            break
+                        batch.append(frame)
+                        size += len(frame)
+
+                    stdout.write(b"".join(batch))
+                    await stdout.drain()
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(stdin_reader)
+            tg.start_soon(stdout_writer)
+            yield read_stream, write_stream
+    finally:
+        if owns_streams:
+            stdin_transport.close()
+            stdout.close()
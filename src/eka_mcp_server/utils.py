@@ -1,14 +1,61 @@
+import asyncio
 import base64
+from typing import Optional
+
 import httpx
 from PIL import Image
 from io import BytesIO
 
+from .eka_client import HTTP2_ENABLED
+
+# Upper bound on protocol images downloaded at the same time
+MAX_CONCURRENT_DOWNLOADS = 20
+
+# Shared across tool calls so protocol images reuse warm connections to the image host
+_image_client: Optional[httpx.AsyncClient] = None
+_download_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_image_client() -> httpx.AsyncClient:
+    global _image_client, _download_slots
+    if _image_client is None:
+        # One connection per download slot; hosts that negotiate HTTP/2 multiplex them onto one connection anyway
+        _image_client = httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENT_DOWNLOADS,
+                max_keepalive_connections=MAX_CONCURRENT_DOWNLOADS,
+                keepalive_expiry=300.0
+            ),
+            http2=HTTP2_ENABLED
+        )
+        _download_slots = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    return _image_client
 
-def download_image(url):
-    response = httpx.get(url)
-    img = Image.open(BytesIO(response.content))
+
+async def close_image_client():
+    """Close the shared image download client, if it was ever created."""
+    global _image_client, _download_slots
+    if _image_client is not None:
+        await _image_client.aclose()
+        _image_client = None
+        _download_slots = None
+
+
+def _resize_to_jpeg_b64(content: bytes) -> str:
+    img = Image.open(BytesIO(content))
     img = img.resize((512, 512))
     buffered = BytesIO()
     img.save(buffered, format="JPEG")
-    img_b64 = base64.b64encode(buffered.getvalue()).decode()
-    return img_b64
\ No newline at end of file
+    # getbuffer() exposes the encoded JPEG without the copy getvalue() would make
+    img_b64 = base64.b64encode(buffered.getbuffer()).decode()
+    return img_b64
+
+
+async def download_image(url):
+    client = _get_image_client()
+    async with _download_slots:
+        response = await client.get(url)
+    response.raise_for_status()
+    # Decoding and resizing is CPU bound, keep it off the event loop
+    return await asyncio.to_thread(_resize_to_jpeg_b64, response.content)
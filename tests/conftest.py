@@ -0,0 +1,24 @@
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from eka_mcp_server import eka_client
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def mock_logger():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_client():
+    with patch('httpx.AsyncClient') as mock, patch.dict(eka_client._shared_clients, clear=True):
+        client_instance = mock.return_value
+        client_instance.post = AsyncMock(return_value=MagicMock())
+        client_instance.get = AsyncMock(return_value=MagicMock())
+        client_instance.aclose = AsyncMock()
+        yield client_instance
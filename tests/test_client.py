@@ -0,0 +1,137 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+from unittest.mock import patch, MagicMock
+
+from eka_mcp_server import eka_client
+from eka_mcp_server.eka_client import EkaCareClient
+
+
+pytestmark = pytest.mark.anyio
+
+
+class TestCaching:
+    async def test_supported_tags_are_cached(self, mock_logger, mock_client):
+        mock_client.get.return_value.status_code = 200
+        mock_client.get.return_value.content = b'[{"text": "Diabetes"}, {"text": ""}, {"text": "Hypertension"}]'
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            assert await client.get_supported_tags() == ("Diabetes", "Hypertension")
+            assert await client.get_supported_tags() == ("Diabetes", "Hypertension")
+            mock_client.get.assert_called_once()
+
+    async def test_concurrent_tag_lookups_share_one_fetch(self, mock_logger, mock_client):
+        response = MagicMock(status_code=200, content=b'[{"text": "Diabetes"}]')
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0)
+            return response
+
+        mock_client.get.side_effect = slow_get
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            results = await asyncio.gather(*(client.get_supported_tags() for _ in range(5)))
+            assert results == [("Diabetes",)] * 5
+            mock_client.get.assert_called_once()
+
+    async def test_failed_tags_fetch_is_not_cached(self, mock_logger, mock_client):
+        mock_client.get.return_value.status_code = 500
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            assert await client.get_supported_tags() == ()
+            assert await client.get_supported_tags() == ()
+            assert mock_client.get.call_count == 2
+
+    async def test_repeated_drug_search_is_served_from_cache(self, mock_logger, mock_client):
+        mock_client.get.return_value.content = b'[{"name": "Glim 1mg"}]'
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            client._set_auth_creds({"access_token": "token", "jwt-payload": {"exp": 2 ** 40}})
+            first = await client.get_suggested_drugs({"drug_name": "Glim", "form": "Tablet"})
+            second = await client.get_suggested_drugs({"form": "Tablet", "drug_name": "Glim"})
+            assert first == second == [{"name": "Glim 1mg"}]
+            mock_client.get.assert_called_once()
+
+    async def test_publishers_are_fetched_for_tags_missing_from_the_tag_list(self, mock_logger, mock_client):
+        mock_client.get.return_value.status_code = 200
+        mock_client.get.return_value.content = b'[{"text": "Diabetes"}]'
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            client._set_auth_creds({"access_token": "token", "jwt-payload": {"exp": 2 ** 40}})
+            assert await client.get_supported_tags() == ("Diabetes",)
+            mock_client.get.return_value.content = b'["ADA"]'
+            assert await client.get_protocol_publisher({"tag": "Migraine"}) == ["ADA"]
+            assert mock_client.get.call_count == 2
+
+    async def test_publishers_are_cached_per_argument_set(self, mock_logger, mock_client):
+        mock_client.get.return_value.content = b'["ADA"]'
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            client._set_auth_creds({"access_token": "token", "jwt-payload": {"exp": 2 ** 40}})
+            await client.get_protocol_publisher({"tag": "Diabetes"})
+            await client.get_protocol_publisher({"tag": "Diabetes"})
+            await client.get_protocol_publisher({"tag": "Diabetes", "auth": "other-token"})
+            assert mock_client.get.call_count == 2
+            assert mock_client.get.call_args.kwargs["headers"] == {"Authorization": "Bearer other-token"}
+
+class TestCoalescing:
+    async def test_identical_protocol_searches_share_one_request(self, mock_logger, mock_client):
+        mock_client.post.return_value.content = b'[{"url": "https://example.com/1.jpg"}]'
+        arguments = {"queries": [{"query": "insulin dosing", "tag": "diabetes", "publisher": "ADA"}]}
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            client._set_auth_creds({"access_token": "token", "jwt-payload": {"exp": 2 ** 40}})
+            results = await asyncio.gather(
+                client.get_protocols(dict(arguments)),
+                client.get_protocols(dict(arguments)),
+            )
+            assert results[0] == results[1] == [{"url": "https://example.com/1.jpg"}]
+            mock_client.post.assert_called_once()
+            assert mock_client.post.call_args.kwargs["headers"]["Authorization"] == "Bearer token"
+
+class TestRequestHeaders:
+    async def test_content_type_is_only_sent_with_a_body(self, mock_logger, mock_client):
+        mock_client.get.return_value.content = b'[]'
+        mock_client.post.return_value.content = b'[]'
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            client._set_auth_creds({"access_token": "token", "jwt-payload": {"exp": 2 ** 40}})
+            await client.get_suggested_drugs({"drug_name": "Glim"})
+            await client.get_protocols({"queries": []})
+            assert mock_client.get.call_args.kwargs["headers"] == {"Authorization": "Bearer token"}
+            assert mock_client.post.call_args.kwargs["headers"] == {
+                "Authorization": "Bearer token", "Content-Type": "application/json"
+            }
+
+    async def test_method_names_are_case_insensitive(self, mock_logger, mock_client):
+        mock_client.get.return_value.content = b'[]'
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            client._set_auth_creds({"access_token": "token", "jwt-payload": {"exp": 2 ** 40}})
+            assert await client._make_request("GET", "medications/v1/search", params={}) == []
+            mock_client.get.assert_called_once()
+
+    async def test_snomed_terms_keep_the_stdlib_json_encoding(self, mock_logger, mock_client):
+        mock_client.get.return_value.content = b'[]'
+
+        async with EkaCareClient("https://api.eka.care", "id", "secret", mock_logger) as client:
+            client._set_auth_creds({"access_token": "token", "jwt-payload": {"exp": 2 ** 40}})
+            await client.get_snomed_linker({"query": ["fever", "\u092e\u0927\u0941\u092e\u0947\u0939"]})
+            assert mock_client.get.call_args.kwargs["params"] == {
+                "text_to_link": '["fever", "\\u092e\\u0927\\u0941\\u092e\\u0947\\u0939"]'
+            }
+
+class TestSharedClient:
+    def test_proxy_environment_keeps_the_default_transport(self):
+        with patch('httpx.AsyncClient') as mock, patch.dict(eka_client._shared_clients, clear=True), \
+                patch.dict(os.environ, {"HTTPS_PROXY": "http://proxy.internal:3128"}):
+            eka_client._get_client("https://api.eka.care")
+            assert "transport" not in mock.call_args.kwargs
+
+    def test_direct_connections_retry_failed_connects(self):
+        with patch('httpx.AsyncClient') as mock, patch.dict(eka_client._shared_clients, clear=True), \
+                patch('urllib.request.getproxies', return_value={}):
+            eka_client._get_client("https://api.eka.care")
+            assert isinstance(mock.call_args.kwargs["transport"], httpx.AsyncHTTPTransport)
@@ -0,0 +1,88 @@
+import logging
+import time
+
+from unittest.mock import MagicMock
+
+from eka_mcp_server.log_handlers import BatchRotatingFileHandler, TimedMemoryHandler
+
+
+def _backups(directory):
+    backups = sorted(directory.glob("server.log.*"), key=lambda path: int(path.suffix[1:]))
+    return [path.read_text() for path in backups]
+
+
+def _record(level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, "message", None, None)
+
+
+class TestTimedMemoryHandler:
+    def test_records_are_flushed_after_the_interval(self):
+        target = MagicMock(spec=logging.Handler)
+        handler = TimedMemoryHandler(100, target, flush_interval=0.05)
+        handler.handle(_record())
+        handler.handle(_record())
+        target.handle.assert_not_called()
+
+        deadline = time.monotonic() + 2
+        while target.handle.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert target.handle.call_count == 2
+        assert handler.buffer == []
+        handler.close()
+
+    def test_errors_are_flushed_immediately(self):
+        target = MagicMock(spec=logging.Handler)
+        handler = TimedMemoryHandler(100, target, flush_interval=60)
+        handler.handle(_record())
+        handler.handle(_record(logging.ERROR))
+        assert target.handle.call_count == 2
+        assert handler._timer is None
+        handler.close()
+
+    def test_batch_is_written_to_the_file_with_one_write(self, tmp_path):
+        log_file = tmp_path / "server.log"
+        target = BatchRotatingFileHandler(log_file, maxBytes=1024 * 1024, backupCount=1)
+        target.stream = MagicMock(wraps=target.stream)
+        handler = TimedMemoryHandler(100, target, flush_interval=60)
+        handler.handle(_record())
+        handler.handle(_record())
+        handler.flush()
+        target.stream.write.assert_called_once_with(b"message\nmessage\n")
+        assert log_file.read_text() == "message\nmessage\n"
+        handler.close()
+        target.close()
+
+
+class TestBatchRotatingFileHandler:
+    def test_rollover_keeps_the_newest_backups(self, tmp_path):
+        log_file = tmp_path / "server.log"
+        handler = BatchRotatingFileHandler(log_file, maxBytes=10, backupCount=2)
+        handler.setFormatter(logging.Formatter("%(message)s %(lineno)d"))
+        for lineno in (1, 2, 3, 4):
+            record = _record()
+            record.lineno = lineno
+            handler.handle(record)
+        handler.close()
+
+        assert log_file.read_text() == "message 4\n"
+        assert _backups(tmp_path) == ["message 2\n", "message 3\n"]
+
+    def test_write_errors_are_reported_not_raised(self, tmp_path):
+        handler = BatchRotatingFileHandler(tmp_path / "server.log", maxBytes=1024, backupCount=1)
+        handler.handleError = MagicMock()
+        handler.stream = MagicMock()
+        handler.stream.write.side_effect = OSError("disk full")
+        handler.handle_batch([_record(), _record(logging.ERROR)])
+        handler.handleError.assert_called_once()
+
+    def test_delayed_open_counts_existing_file_size(self, tmp_path):
+        log_file = tmp_path / "server.log"
+        log_file.write_text("message\n")
+        handler = BatchRotatingFileHandler(log_file, maxBytes=20, backupCount=1, delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.handle(_record())
+        handler.handle(_record())
+        handler.close()
+
+        assert log_file.read_text() == "message\n"
+        assert _backups(tmp_path) == ["message\nmessage\n"]
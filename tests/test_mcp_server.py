@@ -0,0 +1,123 @@
+import asyncio
+from io import BytesIO
+
+import httpx
+import mcp.types as types
+import pytest
+from PIL import Image
+from unittest.mock import MagicMock, AsyncMock
+
+from eka_mcp_server import utils
+from eka_mcp_server.mcp_server import initialize_mcp_server
+
+pytestmark = pytest.mark.anyio
+
+
+def _png_bytes():
+    buffered = BytesIO()
+    Image.new("RGB", (8, 8), "white").save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+@pytest.fixture
+def eka_client_mock():
+    client = MagicMock()
+    client.get_supported_tags = AsyncMock(return_value=("Diabetes",))
+    client.get_protocols = AsyncMock()
+    return client
+
+
+@pytest.fixture
+def image_host(monkeypatch):
+    """Serve protocol images from a handler the test installs, through the shared image client."""
+    routes = {}
+
+    async def handler(request):
+        return await routes["handler"](request)
+
+    monkeypatch.setattr(utils, "_image_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(utils, "_download_slots", asyncio.Semaphore(utils.MAX_CONCURRENT_DOWNLOADS))
+    return routes
+
+
+async def _search_protocols(server):
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(
+            name="indian_treatment_protocol_search",
+            arguments={"queries": [{"query": "first line", "tag": "Diabetes", "publisher": "ICMR"}]},
+        ),
+    )
+    result = (await server.request_handlers[types.CallToolRequest](request)).root
+    assert not result.isError, result.content
+    return result.content
+
+
+class TestProtocolSearch:
+    async def test_images_follow_protocol_order(self, mock_logger, eka_client_mock, image_host):
+        png = _png_bytes()
+        urls = [f"https://images.test/{i}.png" for i in range(4)]
+        eka_client_mock.get_protocols.return_value = [{"url": url, "author": "ICMR"} for url in urls]
+
+        async def handler(request):
+            # The first image finishes last
+            if request.url.path == "/0.png":
+                await asyncio.sleep(0.05)
+            return httpx.Response(200, content=png)
+
+        image_host["handler"] = handler
+        server = initialize_mcp_server(eka_client_mock, mock_logger)
+
+        content = await _search_protocols(server)
+
+        assert [item.url for item in content] == urls
+        assert all(item.type == "image" and item.mimeType == "image/jpeg" for item in content)
+        mock_logger.error.assert_not_called()
+
+    async def test_failed_and_missing_urls_are_logged_and_skipped(self, mock_logger, eka_client_mock, image_host):
+        png = _png_bytes()
+        eka_client_mock.get_protocols.return_value = [
+            {"url": "https://images.test/ok.png"},
+            {"url": "https://images.test/missing.png"},
+            {"url": None},
+        ]
+
+        async def handler(request):
+            if request.url.path == "/missing.png":
+                return httpx.Response(404)
+            return httpx.Response(200, content=png)
+
+        image_host["handler"] = handler
+        server = initialize_mcp_server(eka_client_mock, mock_logger)
+
+        content = await _search_protocols(server)
+
+        assert [item.url for item in content] == ["https://images.test/ok.png"]
+        failed_urls = [call.args[1] for call in mock_logger.error.call_args_list]
+        assert failed_urls == ["https://images.test/missing.png", None]
+
+    async def test_downloads_overlap(self, mock_logger, eka_client_mock, image_host):
+        png = _png_bytes()
+        count = 5
+        eka_client_mock.get_protocols.return_value = [
+            {"url": f"https://images.test/{i}.png"} for i in range(count)
+        ]
+        arrived = 0
+        all_arrived = asyncio.Event()
+
+        async def handler(request):
+            # Every response waits until all downloads are in flight, so serial downloads time out
+            nonlocal arrived
+            arrived += 1
+            if arrived == count:
+                all_arrived.set()
+            await asyncio.wait_for(all_arrived.wait(), timeout=1.0)
+            return httpx.Response(200, content=png)
+
+        image_host["handler"] = handler
+        server = initialize_mcp_server(eka_client_mock, mock_logger)
+
+        content = await _search_protocols(server)
+
+        assert len(content) == count
+        mock_logger.error.assert_not_called()
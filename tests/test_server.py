@@ -0,0 +1,60 @@
+import io
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from eka_mcp_server.server import _configure_logging
+
+
+@pytest.fixture
+def restore_logging():
+    """Undo the process-wide logging changes made by _configure_logging."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    saved_flags = (logging.logThreads, logging.logProcesses, logging.logMultiprocessing, logging._srcfile)
+    root.handlers.clear()
+    yield
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+    logging.logThreads, logging.logProcesses, logging.logMultiprocessing, logging._srcfile = saved_flags
+
+
+class TestConfigureLogging:
+    def test_logs_go_to_stderr_through_the_queue(self, monkeypatch, restore_logging):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        monkeypatch.setattr("sys.stdout", stdout)
+        monkeypatch.setattr("sys.stderr", stderr)
+
+        listener = _configure_logging()
+        try:
+            root_handlers = logging.getLogger().handlers
+            assert len(root_handlers) == 1
+            assert isinstance(root_handlers[0], QueueHandler)
+            stream_handler, = listener.handlers
+            assert stream_handler.stream is stderr
+
+            logging.getLogger("main").info("Starting")
+        finally:
+            listener.stop()
+
+        assert "I main Starting" in stderr.getvalue()
+        assert stdout.getvalue() == ""
+
+    def test_exception_traceback_survives_the_queue(self, monkeypatch, restore_logging):
+        stderr = io.StringIO()
+        monkeypatch.setattr("sys.stderr", stderr)
+
+        listener = _configure_logging()
+        try:
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                logging.getLogger("main").exception("Tool call failed")
+        finally:
+            listener.stop()
+
+        output = stderr.getvalue()
+        assert "E main Tool call failed" in output
+        assert "Traceback (most recent call last)" in output
+        assert "ZeroDivisionError: division by zero" in output
@@ -0,0 +1,76 @@
+import asyncio
+
+import mcp.types as types
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from mcp.shared.message import SessionMessage
+
+from eka_mcp_server.stdio import _encode, _read_lines, stdio_server
+
+
+pytestmark = pytest.mark.anyio
+
+
+def _response(request_id):
+    return SessionMessage(types.JSONRPCMessage(types.JSONRPCResponse(jsonrpc="2.0", id=request_id, result={})))
+
+
+def _stdin(data: bytes, chunk_size: int = 64 * 1024) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader(limit=4 * 1024 * 1024)
+    for start in range(0, len(data), chunk_size):
+        reader.feed_data(data[start:start + chunk_size])
+    reader.feed_eof()
+    return reader
+
+
+def _stdout():
+    stdout = MagicMock()
+    stdout.drain = AsyncMock()
+    return stdout
+
+
+class TestStdioServer:
+    async def test_concurrent_responses_share_one_write(self):
+        stdout = _stdout()
+
+        async with stdio_server(_stdin(b""), stdout) as (_, write_stream):
+            async with write_stream:
+                await asyncio.gather(*(write_stream.send(_response(i)) for i in range(3)))
+
+        stdout.write.assert_called_once()
+        frames = stdout.write.call_args.args[0].splitlines()
+        assert [types.JSONRPCMessage.model_validate_json(frame).root.id for frame in frames] == [0, 1, 2]
+
+    async def test_requests_are_read_line_by_line(self):
+        large_params = '{"text": "%s"}' % ("x" * 1024 * 1024)
+
+        stdin = _stdin(
+            b'{"jsonrpc": "2.0", "id": 1, "method": "ping"}\n'
+            b'not json\n'
+            b'{"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": %s}\n'
+            b'{"jsonrpc": "2.0", "method": "notifications/initialized"}' % large_params.encode()
+        )
+        async with stdio_server(stdin, _stdout()) as (read_stream, write_stream):
+            await write_stream.aclose()
+            messages = [message async for message in read_stream]
+
+        assert messages[0].message.root.method == "ping"
+        assert isinstance(messages[1], Exception)
+        assert messages[2].message.root.params == {"text": "x" * 1024 * 1024}
+        assert messages[3].message.root.method == "notifications/initialized"
+
+    async def test_frames_split_across_reads_are_joined(self):
+        stdin = _stdin(
+            b'{"jsonrpc": "2.0", "id": 1, "method": "ping"}\n\n'
+            b'{"jsonrpc": "2.0", "id": 2, "method": "ping"}\n',
+            chunk_size=7,
+        )
+        ids = [types.JSONRPCMessage.model_validate_json(line).root.id async for line in _read_lines(stdin)]
+        assert ids == [1, 2]
+
+    def test_frames_match_pydantic_encoding(self):
+        message = types.JSONRPCMessage(types.JSONRPCResponse(
+            jsonrpc="2.0", id=7, result={"content": [{"type": "text", "text": "पैरासिटामोल 500mg", "meta": None}]}
+        ))
+        expected = message.model_dump_json(by_alias=True, exclude_none=True).encode() + b"\n"
+        assert _encode(SessionMessage(message)) == expected